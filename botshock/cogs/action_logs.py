@@ -15,6 +15,11 @@ from botshock.utils.decorators import defer_response
 logger = logging.getLogger("BotShock.ActionLogs")
 
 
+def _next_page_cursor(logs: list[dict]) -> tuple[int, int] | None:
+    """Keyset cursor (timestamp_epoch, id) of the page following ``logs``"""
+    return (logs[-1]["timestamp_epoch"], logs[-1]["id"]) if logs else None
+
+
 class LogsPaginationView(disnake.ui.View):
     """View for paginating through action logs"""
 
@@ -28,6 +33,7 @@ class LogsPaginationView(disnake.ui.View):
         db,
         formatter,
         format_log_entry_func,
+        next_cursor: tuple[int, int] | None = None,
     ):
         super().__init__(timeout=180)
         self.author_id = author_id
@@ -38,6 +44,10 @@ class LogsPaginationView(disnake.ui.View):
         self.db = db
         self.formatter = formatter
         self.format_log_entry = format_log_entry_func
+        # Keyset cursors of pages already reached by navigating; other pages use offsets
+        self._page_cursors: dict[int, tuple[int, int]] = {}
+        if next_cursor:
+            self._page_cursors[current_page + 1] = next_cursor
 
         # Disable buttons if at boundaries
         if current_page <= 1:
@@ -80,7 +90,10 @@ class LogsPaginationView(disnake.ui.View):
             limit=logs_per_page,
             offset=offset,
             days=self.days,
+            before=self._page_cursors.get(self.current_page),
         )
+        if logs:
+            self._page_cursors[self.current_page + 1] = _next_page_cursor(logs)
 
         if not logs:
             await inter.edit_original_message(
@@ -233,6 +246,7 @@ class ActionLogs(commands.Cog):
             db=self.db,
             formatter=self.formatter,
             format_log_entry_func=self.helper.build_action_log_entry,
+            next_cursor=_next_page_cursor(logs),
         )
 
         await inter.edit_original_response(embed=embed, view=view)
@@ -210,24 +210,26 @@ class ShockCommand(commands.Cog):
         )
 
         if success:
-            # Update the device cooldown
-            await self.db.update_shocker_cooldown(
-                user.id, inter.guild.id, target_shocker["shocker_id"]
-            )
-
-            # Update controller cooldown (only if not self-controlling)
-            if inter.author.id != user.id:
-                cooldown_duration = await self.db.get_controller_cooldown_duration(
-                    user.id, inter.guild.id
-                )
-                await self.db.update_controller_cooldown(
-                    inter.author.id, user.id, inter.guild.id, cooldown_duration
+            # Record cooldowns and last-used values in a single commit
+            async with self.db.transaction():
+                # Update the device cooldown
+                await self.db.update_shocker_cooldown(
+                    user.id, inter.guild.id, target_shocker["shocker_id"]
                 )
 
-            # Update last-used values for smart defaults
-            await self.db.update_last_used_values(
-                inter.author.id, inter.guild.id, user.id, intensity, duration, shock_type
-            )
+                # Update controller cooldown (only if not self-controlling)
+                if inter.author.id != user.id:
+                    cooldown_duration = await self.db.get_controller_cooldown_duration(
+                        user.id, inter.guild.id
+                    )
+                    await self.db.update_controller_cooldown(
+                        inter.author.id, user.id, inter.guild.id, cooldown_duration
+                    )
+
+                # Update last-used values for smart defaults
+                await self.db.update_last_used_values(
+                    inter.author.id, inter.guild.id, user.id, intensity, duration, shock_type
+                )
 
             shocker_name = target_shocker["shocker_name"] or "Unnamed Shocker"
             logger.info(
@@ -1,7 +1,7 @@
 """
 Database module for Bot Shock.
 
-This module provides the Database class which manages an aiosqlite connection pool
+This module provides the Database class which manages a long-lived aiosqlite connection
 and a set of synchronous helpers used by scheduler components. The Database no
 longer performs schema initialization synchronously at import time; instead,
 callers should await Database.initialize() during application startup.
@@ -10,15 +10,165 @@ callers should await Database.initialize() during application startup.
 import asyncio
 import logging
 import sqlite3
+import time
 from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import UTC, datetime, timedelta
 
 import aiosqlite
 
+from botshock.utils.cache import TTLCache
 from botshock.utils.encryption import EncryptionHandler
 
 logger = logging.getLogger("BotShock.Database")
 
+# Pragmas applied to every pooled connection when it is opened. The workload is
+# read-heavy (cooldown checks, trigger lookups, guild settings, reminder polls), so
+# connections are tuned to keep their page cache hot for their whole lifetime:
+# WAL lets readers proceed while a writer is active, mmap serves hot pages without
+# read() syscalls, and the 64MB page cache keeps user/trigger pages resident.
+# Each persistent connection may therefore grow to ~64MB of RSS in exchange for
+# microsecond-latency cache hits on repeated get_user/get_triggers calls.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# Compiled statements kept per connection by the sqlite3 module (default 128). Every
+# query in this module uses constant SQL text bound with parameters, so with long-lived
+# connections each statement is prepared once; the headroom covers the schema/migration
+# statements and the variable-length IN (...) permission lookups.
+_STATEMENT_CACHE_SIZE = 256
+
+# Shared INSERT statements so single-row and bulk paths prepare identical SQL
+_SQL_INSERT_TRIGGER = """
+    INSERT INTO triggers (user_id, regex_pattern, trigger_name, shock_type, intensity, duration, cooldown_seconds)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Single-row variant: RETURNING (SQLite 3.35+) hands back the new ID explicitly
+# instead of relying on cursor.lastrowid
+_SQL_INSERT_TRIGGER_RETURNING_ID = _SQL_INSERT_TRIGGER + "RETURNING id\n"
+
+_SQL_INSERT_ACTION_LOG = """
+    INSERT INTO controller_action_logs (
+        guild_id, controller_discord_id, controller_username,
+        target_discord_id, target_username, action_type,
+        shock_type, intensity, duration, shocker_id, shocker_name,
+        success, error_message, source, metadata, timestamp_epoch
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# get_user results keyed by (discord_id, guild_id); users rows only change through
+# add_user/remove_user/set_device_worn, which invalidate their entry
+_USER_CACHE_MAXSIZE = 10_000
+_USER_CACHE_TTL = 300
+
+# Per-target cooldown durations and per-controller preferences are read on every shock
+# command but only change through their setters, which invalidate the cached entries
+_SETTINGS_CACHE_MAXSIZE = 10_000
+_SETTINGS_CACHE_TTL = 600
+
+# Action logs are buffered in memory and written in batches: flushed every
+# _LOG_FLUSH_INTERVAL seconds, or as soon as _LOG_FLUSH_MAX_ROWS rows are queued
+_LOG_FLUSH_INTERVAL = 0.5
+_LOG_FLUSH_MAX_ROWS = 128
+# Rows removed per transaction by delete_old_action_logs
+_LOG_DELETE_CHUNK = 1000
+
+# Composite indexes matching the WHERE/ORDER BY of the permission and action log
+# queries. Cooldown and preference lookups are already served by their UNIQUE
+# constraints' implicit indexes.
+_COMPOSITE_INDEXES = {
+    "idx_controller_permissions_sub_controller": (
+        "ON controller_permissions(sub_user_id, controller_discord_id, controller_role_id)"
+    ),
+    "idx_action_logs_target_epoch": (
+        "ON controller_action_logs(target_discord_id, guild_id, timestamp_epoch DESC)"
+    ),
+    "idx_action_logs_controller_epoch": (
+        "ON controller_action_logs(controller_discord_id, guild_id, timestamp_epoch DESC)"
+    ),
+    "idx_action_logs_epoch": "ON controller_action_logs(timestamp_epoch)",
+}
+
+# Older indexes that are leading prefixes of the composites above, or that were keyed
+# on the text timestamp column before action logs gained timestamp_epoch
+_REDUNDANT_INDEXES = (
+    "idx_controller_permissions_sub",
+    "idx_action_logs_target",
+    "idx_action_logs_controller",
+    "idx_action_logs_target_time",
+    "idx_action_logs_controller_time",
+    "idx_action_logs_timestamp",
+)
+
+# Seed last_control_epoch from the legacy UTC text timestamp when migrating old databases
+_SQL_BACKFILL_CONTROL_EPOCH = """
+    UPDATE controller_cooldowns
+    SET last_control_epoch = CAST(strftime('%s', last_control_time) AS INTEGER)
+    WHERE last_control_epoch IS NULL
+"""
+
+# Seed timestamp_epoch from the legacy UTC text timestamp when migrating old databases
+_SQL_BACKFILL_LOG_EPOCH = """
+    UPDATE controller_action_logs
+    SET timestamp_epoch = CAST(strftime('%s', timestamp) AS INTEGER)
+    WHERE timestamp_epoch IS NULL
+"""
+
+_SQL_UPSERT_SHOCKER = """
+    INSERT INTO shockers (user_id, shocker_id, shocker_name)
+    VALUES (?, ?, ?)
+    ON CONFLICT(user_id, shocker_id) DO UPDATE SET
+        shocker_name = excluded.shocker_name
+"""
+
+# Query variants selected by a boolean flag (include_completed / enabled_only); built
+# once at import so each call site is a single dict lookup with constant SQL text
+_SQL_TRIGGERS_FOR_USER = {
+    flag: f"""
+    SELECT id, trigger_name, regex_pattern, shock_type, intensity, duration,
+           cooldown_seconds, last_trigger_time, enabled, created_at
+    FROM triggers WHERE user_id = ?{" AND enabled = 1" if flag else ""}
+    ORDER BY created_at
+"""
+    for flag in (True, False)
+}
+
+
+def _reminder_list_sql(where: str) -> dict[bool, str]:
+    """Build the include_completed -> SQL mapping for a reminder listing query"""
+    return {
+        include_completed: f"""
+    SELECT id, target_discord_id, creator_discord_id, scheduled_time,
+           reason, shock_type, intensity, duration, channel_id, completed, created_at
+    FROM reminders
+    WHERE {where}{"" if include_completed else " AND completed = 0"}
+    ORDER BY scheduled_time
+"""
+        for include_completed in (True, False)
+    }
+
+
+_SQL_REMINDERS_BY_GUILD = _reminder_list_sql("guild_id = ?")
+_SQL_REMINDERS_BY_CREATOR = _reminder_list_sql("guild_id = ? AND creator_discord_id = ?")
+_SQL_REMINDERS_FOR_TARGET = _reminder_list_sql("guild_id = ? AND target_discord_id = ?")
+
+
+async def _fetch_first(conn: aiosqlite.Connection, sql: str, params: tuple) -> aiosqlite.Row | None:
+    """Run a single-row query in one hop to the connection's worker thread.
+
+    cursor() + execute() + fetchone() costs three round trips to aiosqlite's thread;
+    execute_fetchall() does the same work in one.
+    """
+    rows = await conn.execute_fetchall(sql, params)
+    return rows[0] if rows else None
+
 
 class Database:
     """Database handler for BotShock with multi-guild support and async operations.
@@ -48,83 +198,173 @@ class Database:
         self._is_memory = self._use_uri and ("mode=memory" in self.db_path)
 
         self.encryptor = EncryptionHandler(encryption_key)
-        self._connection_pool: list[aiosqlite.Connection] = []
-        self._pool_lock = asyncio.Lock()
-        self._pool_size = pool_size
+        self._user_cache = TTLCache(maxsize=_USER_CACHE_MAXSIZE, ttl=_USER_CACHE_TTL)
+        # (target_discord_id, guild_id) -> cooldown seconds
+        self._cooldown_duration_cache = TTLCache(
+            maxsize=_SETTINGS_CACHE_MAXSIZE, ttl=_SETTINGS_CACHE_TTL
+        )
+        # (controller_discord_id, guild_id) -> {target_discord_id: preferences row or None};
+        # keyed per controller because general (NULL target) rows back every target lookup
+        self._prefs_cache = TTLCache(maxsize=_SETTINGS_CACHE_MAXSIZE, ttl=_SETTINGS_CACHE_TTL)
+        # SQLite allows one writer alongside many WAL readers: every INSERT/UPDATE/DELETE goes
+        # through a single long-lived writer connection, SELECT-only methods fan out over a
+        # pool of read-only connections. Both keep their page/statement caches warm.
+        self._conn: aiosqlite.Connection | None = None
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._read_conns: list[aiosqlite.Connection] = []
+        self._init_lock = asyncio.Lock()
+        # Serializes use of the writer connection so transactions don't interleave
+        self._conn_lock = asyncio.Lock()
+        # Writer connection of the transaction() block the current task is in, if any
+        self._tx_conn: ContextVar[aiosqlite.Connection | None] = ContextVar(
+            f"botshock_db_tx_{id(self)}", default=None
+        )
+        self._pool_size = max(1, pool_size)
         self._initialized = False
+        # Write-behind buffer for log_controller_action rows, drained by _log_flush_loop
+        self._log_buffer: list[tuple] = []
+        self._log_flush_task: asyncio.Task | None = None
 
-        # NOTE: initialization (schema creation and pool warmup) is deferred to
+        # NOTE: initialization (schema creation and connection setup) is deferred to
         # the asynchronous initialize() method so importing this module is side effect free.
 
     async def initialize(self):
-        """Initialize database schema and create a connection pool.
+        """Initialize database schema and open the shared connection.
 
         This method is idempotent and safe to call multiple times.
         """
-        if self._initialized:
-            return
-
-        if self._is_memory:
-            # Create first async connection and initialize schema to keep the in-memory DB alive
-            first_conn = await aiosqlite.connect(self.db_path, uri=self._use_uri)
-            first_conn.row_factory = aiosqlite.Row
-            await self._init_schema_async(first_conn)
-            self._connection_pool.append(first_conn)
-            # Create remaining connections
-            for _ in range(self._pool_size - 1):
-                conn = await aiosqlite.connect(self.db_path, uri=self._use_uri)
-                conn.row_factory = aiosqlite.Row
-                self._connection_pool.append(conn)
-        else:
-            # Disk-based DB: create schema synchronously then open pool
-            self.init_database()
-            for _ in range(self._pool_size):
-                conn = await aiosqlite.connect(self.db_path, uri=self._use_uri)
-                conn.row_factory = aiosqlite.Row
-                self._connection_pool.append(conn)
-
-        self._initialized = True
-        logger.info(f"Database initialized with connection pool of {self._pool_size}")
+        async with self._init_lock:
+            if self._initialized:
+                return
+
+            if self._is_memory:
+                # Initialize the schema on the shared connection; it keeps the in-memory DB alive
+                self._conn = await self._open_connection()
+                await self._init_schema_async(self._conn)
+            else:
+                # Disk-based DB: create schema synchronously then open the shared connection
+                self.init_database()
+                self._conn = await self._open_connection()
+                # Shared-cache in-memory DBs use table-level locks rather than WAL, so
+                # separate readers would block on the writer; they read via the writer instead.
+                for _ in range(self._pool_size):
+                    read_conn = await self._open_connection()
+                    await read_conn.execute("PRAGMA query_only=1")
+                    self._read_conns.append(read_conn)
+                    self._read_pool.put_nowait(read_conn)
+
+            self._initialized = True
+            self._log_flush_task = asyncio.create_task(self._log_flush_loop())
+        logger.info(
+            f"Database initialized with one writer and {len(self._read_conns)} read connections"
+        )
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Connection factory: open a connection and apply the tuning pragmas.
+
+        Pragmas are executed once per connection; since connections are long-lived,
+        their page cache, mmap region and compiled statement cache stay warm across queries.
+        """
+        conn = await aiosqlite.connect(
+            self.db_path, uri=self._use_uri, cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = aiosqlite.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        return conn
 
     async def close(self):
-        """Close all pooled connections"""
-        async with self._pool_lock:
-            for conn in self._connection_pool:
-                await conn.close()
-            self._connection_pool.clear()
-        logger.info("Database connection pool closed")
+        """Flush buffered action logs, then close the writer and all read connections"""
+        if self._log_flush_task is not None:
+            self._log_flush_task.cancel()
+            try:
+                await self._log_flush_task
+            except asyncio.CancelledError:
+                pass
+            self._log_flush_task = None
+        if self._initialized:
+            await self.flush_logs()
+
+        async with self._init_lock:
+            for read_conn in self._read_conns:
+                await read_conn.close()
+            self._read_conns.clear()
+            self._read_pool = asyncio.Queue()
+            if self._conn is not None:
+                async with self._conn_lock:
+                    await self._conn.close()
+                self._conn = None
+            self._initialized = False
+        logger.info("Database connections closed")
 
     @asynccontextmanager
-    async def get_connection(self):
-        """Async context manager for database connections from pool"""
+    async def get_read_connection(self):
+        """Async context manager yielding a read-only connection from the pool.
+
+        Only use it for SELECT statements. In-memory databases have no separate
+        readers, so the writer connection is used instead.
+        """
         if not self._initialized:
             await self.initialize()
 
-        conn = None
-        async with self._pool_lock:
-            if self._connection_pool:
-                conn = self._connection_pool.pop()
-
-        if conn is None:
-            # Fallback: create new connection if pool is exhausted
-            conn = await aiosqlite.connect(self.db_path, uri=self._use_uri)
-            conn.row_factory = aiosqlite.Row
-            logger.warning("Connection pool exhausted, creating new connection")
+        # Inside transaction() reads must see its uncommitted writes
+        if not self._read_conns or self._tx_conn.get() is not None:
+            async with self.get_write_connection() as conn:
+                yield conn
+            return
 
+        conn = await self._read_pool.get()
         try:
             yield conn
-            await conn.commit()
-        except Exception as e:
-            await conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
         finally:
-            # Return connection to pool
-            async with self._pool_lock:
-                if len(self._connection_pool) < self._pool_size:
-                    self._connection_pool.append(conn)
-                else:
-                    await conn.close()
+            self._read_pool.put_nowait(conn)
+
+    @asynccontextmanager
+    async def get_write_connection(self):
+        """Async context manager yielding the single writer connection.
+
+        The connection is never closed here; the work done inside the block is
+        committed on success and rolled back on error. Inside a transaction() block
+        the transaction's connection is yielded and committing is left to it.
+        """
+        tx_conn = self._tx_conn.get()
+        if tx_conn is not None:
+            yield tx_conn
+            return
+
+        if not self._initialized:
+            await self.initialize()
+
+        async with self._conn_lock:
+            conn = self._conn
+            try:
+                yield conn
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Group several write methods into one BEGIN IMMEDIATE ... COMMIT.
+
+        Database methods called inside the block join the transaction instead of
+        committing on their own, so the group pays for a single commit. Nested
+        transaction() blocks join the outermost one.
+        """
+        tx_conn = self._tx_conn.get()
+        if tx_conn is not None:
+            yield tx_conn
+            return
+
+        async with self.get_write_connection() as conn:
+            await conn.execute("BEGIN IMMEDIATE")
+            token = self._tx_conn.set(conn)
+            try:
+                yield conn
+            finally:
+                self._tx_conn.reset(token)
 
     @contextmanager
     def get_connection_sync(self):
@@ -234,6 +474,7 @@ class Database:
                     target_discord_id INTEGER NOT NULL,
                     guild_id INTEGER NOT NULL,
                     last_control_time TIMESTAMP NOT NULL,
+                    last_control_epoch INTEGER,
                     cooldown_seconds INTEGER NOT NULL DEFAULT 300,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE(controller_discord_id, target_discord_id, guild_id)
@@ -241,6 +482,22 @@ class Database:
             """
             )
 
+            # Migration: Add last_control_epoch (Unix seconds) so cooldown checks skip datetime parsing
+            cursor.execute(
+                """
+                PRAGMA table_info(controller_cooldowns)
+                """
+            )
+            columns = [column[1] for column in cursor.fetchall()]
+            if "last_control_epoch" not in columns:
+                cursor.execute(
+                    """
+                    ALTER TABLE controller_cooldowns ADD COLUMN last_control_epoch INTEGER
+                    """
+                )
+                cursor.execute(_SQL_BACKFILL_CONTROL_EPOCH)
+                logger.info("Migration: Added last_control_epoch column to controller_cooldowns table")
+
             # Create controller action logs table - comprehensive audit trail
             cursor.execute(
                 """
@@ -262,11 +519,28 @@ class Database:
                     source TEXT,
                     metadata TEXT,
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp_epoch INTEGER,
                     FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
                 )
             """
             )
 
+            # Migration: Add timestamp_epoch (Unix seconds) so log range filters compare integers
+            cursor.execute(
+                """
+                PRAGMA table_info(controller_action_logs)
+                """
+            )
+            columns = [column[1] for column in cursor.fetchall()]
+            if "timestamp_epoch" not in columns:
+                cursor.execute(
+                    """
+                    ALTER TABLE controller_action_logs ADD COLUMN timestamp_epoch INTEGER
+                    """
+                )
+                cursor.execute(_SQL_BACKFILL_LOG_EPOCH)
+                logger.info("Migration: Added timestamp_epoch column to controller_action_logs table")
+
             # Create triggers table - now linked to user-guild pair
             cursor.execute(
                 """
@@ -350,13 +624,6 @@ class Database:
             """
             )
 
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_controller_permissions_sub
-                ON controller_permissions(sub_user_id)
-            """
-            )
-
             cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_controller_permissions_user
@@ -392,26 +659,17 @@ class Database:
             """
             )
 
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_action_logs_target
-                ON controller_action_logs(target_discord_id, guild_id)
-            """
-            )
-
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_action_logs_controller
-                ON controller_action_logs(controller_discord_id, guild_id)
-            """
-            )
-
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_action_logs_timestamp
-                ON controller_action_logs(timestamp DESC)
-            """
-            )
+            # Composite indexes backing the permission / action log lookups
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            existing_indexes = {row[0] for row in cursor.fetchall()}
+            for name, definition in _COMPOSITE_INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+            for name in _REDUNDANT_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            if not existing_indexes.issuperset(_COMPOSITE_INDEXES):
+                # Refresh planner statistics so the new indexes are picked up
+                cursor.execute("ANALYZE")
+                logger.info("Migration: Created composite indexes and refreshed statistics")
 
             conn.commit()
             logger.info("Database initialized successfully")
@@ -503,12 +761,29 @@ class Database:
                     target_discord_id INTEGER NOT NULL,
                     guild_id INTEGER NOT NULL,
                     last_control_time TIMESTAMP NOT NULL,
+                    last_control_epoch INTEGER,
                     cooldown_seconds INTEGER NOT NULL DEFAULT 300,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE(controller_discord_id, target_discord_id, guild_id)
                 )
                 """
             )
+            # Migration: Add last_control_epoch column if it doesn't exist (for existing databases)
+            try:
+                await cursor.execute("PRAGMA table_info(controller_cooldowns)")
+                columns = [row[1] for row in await cursor.fetchall()]
+                if "last_control_epoch" not in columns:
+                    await cursor.execute(
+                        "ALTER TABLE controller_cooldowns ADD COLUMN last_control_epoch INTEGER"
+                    )
+                    await cursor.execute(_SQL_BACKFILL_CONTROL_EPOCH)
+                    logger.info(
+                        "Migration: Added last_control_epoch column to controller_cooldowns table"
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Migration check for last_control_epoch column failed (may already exist): {e}"
+                )
             # Controller action logs
             await cursor.execute(
                 """
@@ -530,10 +805,27 @@ class Database:
                     source TEXT,
                     metadata TEXT,
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp_epoch INTEGER,
                     FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
                 )
                 """
             )
+            # Migration: Add timestamp_epoch column if it doesn't exist (for existing databases)
+            try:
+                await cursor.execute("PRAGMA table_info(controller_action_logs)")
+                columns = [row[1] for row in await cursor.fetchall()]
+                if "timestamp_epoch" not in columns:
+                    await cursor.execute(
+                        "ALTER TABLE controller_action_logs ADD COLUMN timestamp_epoch INTEGER"
+                    )
+                    await cursor.execute(_SQL_BACKFILL_LOG_EPOCH)
+                    logger.info(
+                        "Migration: Added timestamp_epoch column to controller_action_logs table"
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Migration check for timestamp_epoch column failed (may already exist): {e}"
+                )
             # Triggers
             await cursor.execute(
                 """
@@ -612,12 +904,6 @@ class Database:
                 ON shockers(user_id)
                 """
             )
-            await cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_controller_permissions_sub
-                ON controller_permissions(sub_user_id)
-                """
-            )
             await cursor.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_controller_permissions_user
@@ -648,24 +934,15 @@ class Database:
                 ON reminders(scheduled_time, completed)
                 """
             )
-            await cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_action_logs_target
-                ON controller_action_logs(target_discord_id, guild_id)
-                """
-            )
-            await cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_action_logs_controller
-                ON controller_action_logs(controller_discord_id, guild_id)
-                """
-            )
-            await cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_action_logs_timestamp
-                ON controller_action_logs(timestamp DESC)
-                """
-            )
+            # Composite indexes backing the permission / action log lookups
+            await cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            existing_indexes = {row[0] for row in await cursor.fetchall()}
+            for name, definition in _COMPOSITE_INDEXES.items():
+                await cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+            for name in _REDUNDANT_INDEXES:
+                await cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            if not existing_indexes.issuperset(_COMPOSITE_INDEXES):
+                await cursor.execute("ANALYZE")
             await conn.commit()
             logger.info("Async database schema initialized successfully")
         except Exception as e:
@@ -680,7 +957,7 @@ class Database:
         """Set the control role IDs for a guild"""
         try:
             role_ids_str = ",".join(str(rid) for rid in role_ids) if role_ids else ""
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -702,7 +979,7 @@ class Database:
     async def get_guild_control_roles(self, guild_id: int) -> list[int]:
         """Get the control role IDs for a guild"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -721,24 +998,21 @@ class Database:
     async def get_guild_settings(self, guild_id: int) -> dict | None:
         """Get all settings for a guild"""
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT guild_id, guild_name, control_role_ids, created_at, updated_at
                     FROM guild_settings WHERE guild_id = ?
                 """,
                     (guild_id,),
                 )
-                row = await cursor.fetchone()
                 if row:
-                    from typing import Any
-
-                    settings: dict[str, Any] = dict(row)
+                    settings = dict(row)
                     control_roles = settings.get("control_role_ids")
                     if control_roles:
                         settings["control_role_ids"] = [
-                            int(rid) for rid in str(control_roles).split(",") if rid
+                            int(rid) for rid in control_roles.split(",") if rid
                         ]
                     else:
                         settings["control_role_ids"] = []
@@ -786,7 +1060,7 @@ class Database:
             encrypted_token = self.encryptor.encrypt(
                 api_token, user_id=discord_id, guild_id=guild_id
             )
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -800,39 +1074,59 @@ class Database:
                 """,
                     (discord_id, guild_id, discord_username, encrypted_token, api_server),
                 )
-                logger.info(
-                    f"Added/updated user: {discord_username} ({discord_id}) in guild {guild_id}"
-                )
-                return True
+            # Invalidate only once the write is committed so no reader re-caches the old row
+            self._user_cache.pop((discord_id, guild_id), None)
+            logger.info(f"Added/updated user: {discord_username} ({discord_id}) in guild {guild_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to add user {discord_id} in guild {guild_id}: {e}")
             return False
 
     async def get_user(self, discord_id: int, guild_id: int) -> dict | None:
         """Get user by Discord ID and guild ID with decrypted API token"""
+        cached = self._user_cache.get((discord_id, guild_id))
+        if cached is not None:
+            return dict(cached)
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT id, discord_id, guild_id, discord_username, openshock_api_token, api_server, created_at, updated_at
                     FROM users WHERE discord_id = ? AND guild_id = ?
                 """,
                     (discord_id, guild_id),
                 )
-                row = await cursor.fetchone()
                 if row:
                     user_dict = dict(row)
                     # Decrypt the API token with user-specific key
                     user_dict["openshock_api_token"] = self.encryptor.decrypt(
                         user_dict["openshock_api_token"], user_id=discord_id, guild_id=guild_id
                     )
-                    return user_dict
+                    # Rows read inside transaction() may still be rolled back
+                    if self._tx_conn.get() is None:
+                        self._user_cache[(discord_id, guild_id)] = user_dict
+                    return dict(user_dict)
                 return None
         except Exception as e:
             logger.error(f"Failed to get user {discord_id} in guild {guild_id}: {e}")
             return None
 
+    async def _get_user_internal_id(self, discord_id: int, guild_id: int) -> int | None:
+        """Resolve a user's internal primary key without decrypting their API token"""
+        cached = self._user_cache.get((discord_id, guild_id))
+        if cached is not None:
+            return cached["id"]
+        async with self.get_read_connection() as conn:
+            row = await _fetch_first(
+                conn,
+                """
+                SELECT id FROM users WHERE discord_id = ? AND guild_id = ?
+            """,
+                (discord_id, guild_id),
+            )
+            return row["id"] if row else None
+
     async def add_shocker(
         self, discord_id: int, guild_id: int, shocker_id: str, shocker_name: str | None = None
     ) -> bool:
@@ -845,15 +1139,10 @@ class Database:
                 return False
 
             # Shocker IDs are NOT encrypted - they need to be sent to OpenShock API in plain text
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
-                    """
-                    INSERT INTO shockers (user_id, shocker_id, shocker_name)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(user_id, shocker_id) DO UPDATE SET
-                        shocker_name = excluded.shocker_name
-                """,
+                    _SQL_UPSERT_SHOCKER,
                     (user["id"], shocker_id, shocker_name),
                 )
                 logger.info(f"Added shocker for user {discord_id} in guild {guild_id}")
@@ -862,6 +1151,43 @@ class Database:
             logger.error(f"Failed to add shocker for user {discord_id} in guild {guild_id}: {e}")
             return False
 
+    async def add_shockers_bulk(
+        self, discord_id: int, guild_id: int, shockers: list[tuple[str, str | None]]
+    ) -> list[str]:
+        """Add several shockers for a user in one transaction.
+
+        Args:
+            discord_id: Discord user ID
+            guild_id: Discord guild ID
+            shockers: (shocker_id, shocker_name) pairs
+
+        Returns:
+            The shocker IDs that were stored (empty on failure)
+        """
+        if not shockers:
+            return []
+        try:
+            user_id = await self._get_user_internal_id(discord_id, guild_id)
+            if user_id is None:
+                logger.error(
+                    f"Cannot add shockers: user {discord_id} not found in guild {guild_id}"
+                )
+                return []
+
+            # executemany runs in the single implicit transaction committed by get_write_connection
+            async with self.get_write_connection() as conn:
+                await conn.executemany(
+                    _SQL_UPSERT_SHOCKER,
+                    [(user_id, shocker_id, shocker_name) for shocker_id, shocker_name in shockers],
+                )
+            logger.info(
+                f"Added {len(shockers)} shockers for user {discord_id} in guild {guild_id}"
+            )
+            return [shocker_id for shocker_id, _ in shockers]
+        except Exception as e:
+            logger.error(f"Failed to add shockers for user {discord_id} in guild {guild_id}: {e}")
+            return []
+
     async def remove_shocker(self, discord_id: int, guild_id: int, shocker_id: str) -> bool:
         """Remove a shocker from a user"""
         try:
@@ -870,7 +1196,7 @@ class Database:
                 return False
 
             # Shocker IDs are stored in plain text
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -893,7 +1219,7 @@ class Database:
             if not user:
                 return []
 
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -922,7 +1248,7 @@ class Database:
                 return False
 
             # Shocker IDs are stored in plain text
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -946,16 +1272,15 @@ class Database:
                 return False
 
             # Shocker IDs are stored in plain text
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT last_shock_time FROM shockers
                     WHERE user_id = ? AND shocker_id = ?
                 """,
                     (user["id"], shocker_id),
                 )
-                row = await cursor.fetchone()
 
                 if not row or not row["last_shock_time"]:
                     return True
@@ -987,24 +1312,21 @@ class Database:
                 logger.error(f"Cannot add trigger: user {discord_id} not found in guild {guild_id}")
                 return None
 
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
-                    """
-                    INSERT INTO triggers (user_id, trigger_name, regex_pattern, shock_type, intensity, duration, cooldown_seconds)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                    _SQL_INSERT_TRIGGER_RETURNING_ID,
                     (
                         user["id"],
-                        trigger_name,
                         regex_pattern,
+                        trigger_name,
                         shock_type,
                         intensity,
                         duration,
                         cooldown_seconds,
                     ),
                 )
-                trigger_id = cursor.lastrowid
+                trigger_id = (await cursor.fetchone())["id"]
                 logger.info(
                     f"Added trigger {trigger_id} for user {discord_id} in guild {guild_id}: {regex_pattern} (cooldown: {cooldown_seconds}s)"
                 )
@@ -1013,6 +1335,48 @@ class Database:
             logger.error(f"Failed to add trigger for user {discord_id} in guild {guild_id}: {e}")
             return None
 
+    async def add_triggers_bulk(
+        self,
+        discord_id: int,
+        guild_id: int,
+        triggers: list[tuple[str, str | None, str, int, int, int]],
+    ) -> list[int]:
+        """Add several triggers for a user in one transaction.
+
+        Args:
+            discord_id: Discord user ID
+            guild_id: Discord guild ID
+            triggers: (regex_pattern, trigger_name, shock_type, intensity, duration,
+                cooldown_seconds) tuples, in the same order as add_trigger's arguments
+
+        Returns:
+            IDs of the created triggers (empty on failure)
+        """
+        if not triggers:
+            return []
+        try:
+            user_id = await self._get_user_internal_id(discord_id, guild_id)
+            if user_id is None:
+                logger.error(
+                    f"Cannot add triggers: user {discord_id} not found in guild {guild_id}"
+                )
+                return []
+
+            async with self.get_write_connection() as conn:
+                await conn.executemany(_SQL_INSERT_TRIGGER, [(user_id, *t) for t in triggers])
+                # executemany doesn't expose per-row IDs; the rows were written inside one
+                # write transaction, so their AUTOINCREMENT IDs are contiguous.
+                cursor = await conn.execute("SELECT last_insert_rowid()")
+                last_id = (await cursor.fetchone())[0]
+            trigger_ids = list(range(last_id - len(triggers) + 1, last_id + 1))
+            logger.info(
+                f"Added {len(trigger_ids)} triggers for user {discord_id} in guild {guild_id}"
+            )
+            return trigger_ids
+        except Exception as e:
+            logger.error(f"Failed to add triggers for user {discord_id} in guild {guild_id}: {e}")
+            return []
+
     async def remove_trigger(self, discord_id: int, guild_id: int, trigger_id: int) -> bool:
         """Remove a trigger"""
         try:
@@ -1020,7 +1384,7 @@ class Database:
             if not user:
                 return False
 
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1047,7 +1411,7 @@ class Database:
             if not user:
                 return False
 
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1068,7 +1432,7 @@ class Database:
     async def update_trigger_cooldown(self, trigger_id: int) -> bool:
         """Update the last trigger time for a trigger"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1090,16 +1454,15 @@ class Database:
             tuple: (is_ready: bool, seconds_remaining: int)
         """
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT last_trigger_time, cooldown_seconds FROM triggers
                     WHERE id = ?
                 """,
                     (trigger_id,),
                 )
-                row = await cursor.fetchone()
 
                 if not row:
                     return False, 0
@@ -1130,29 +1493,10 @@ class Database:
             if not user:
                 return []
 
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                if enabled_only:
-                    await cursor.execute(
-                        """
-                        SELECT id, trigger_name, regex_pattern, shock_type, intensity, duration,
-                               cooldown_seconds, last_trigger_time, enabled, created_at
-                        FROM triggers WHERE user_id = ? AND enabled = 1
-                        ORDER BY created_at
-                    """,
-                        (user["id"],),
-                    )
-                else:
-                    await cursor.execute(
-                        """
-                        SELECT id, trigger_name, regex_pattern, shock_type, intensity, duration,
-                               cooldown_seconds, last_trigger_time, enabled, created_at
-                        FROM triggers WHERE user_id = ?
-                        ORDER BY created_at
-                    """,
-                        (user["id"],),
-                    )
-                rows = await cursor.fetchall()
+            async with self.get_read_connection() as conn:
+                rows = await conn.execute_fetchall(
+                    _SQL_TRIGGERS_FOR_USER[enabled_only], (user["id"],)
+                )
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Failed to get triggers for user {discord_id} in guild {guild_id}: {e}")
@@ -1161,7 +1505,7 @@ class Database:
     async def get_all_enabled_triggers_for_guild(self, guild_id: int) -> dict[int, list[dict]]:
         """Get all enabled triggers grouped by discord_id for a specific guild"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1206,7 +1550,7 @@ class Database:
     ) -> int | None:
         """Add a scheduled reminder/shock with optional recurrence (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1214,6 +1558,7 @@ class Database:
                                          reason, shock_type, intensity, duration, channel_id,
                                          is_recurring, recurrence_pattern)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
                 """,
                     (
                         guild_id,
@@ -1229,7 +1574,7 @@ class Database:
                         recurrence_pattern,
                     ),
                 )
-                reminder_id = cursor.lastrowid
+                reminder_id = (await cursor.fetchone())["id"]
                 recurrence_info = f" (recurring: {recurrence_pattern})" if is_recurring else ""
                 logger.info(
                     f"Added reminder {reminder_id} in guild {guild_id} for user {target_discord_id} at {scheduled_time}{recurrence_info}"
@@ -1242,7 +1587,7 @@ class Database:
     async def get_pending_reminders(self) -> list[dict]:
         """Get all pending reminders that are due (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 current_time = datetime.now().isoformat()
                 await cursor.execute(
@@ -1262,10 +1607,63 @@ class Database:
             logger.error(f"Failed to get pending reminders: {e}")
             return []
 
+    async def claim_pending_reminders(self, limit: int = 256) -> list[dict]:
+        """Fetch due reminders and mark the non-recurring ones completed in one transaction.
+
+        Claiming atomically prevents the same reminder from firing twice and saves the
+        scheduler a separate completion commit per reminder. Returned non-recurring rows
+        carry ``completed = 1``; recurring rows are left for update_recurring_reminder.
+        """
+        try:
+            async with self.transaction() as conn:
+                cursor = await conn.cursor()
+                await cursor.execute(
+                    """
+                    SELECT id, guild_id, target_discord_id, creator_discord_id, scheduled_time,
+                           reason, shock_type, intensity, duration, channel_id, created_at,
+                           is_recurring, recurrence_pattern, last_executed
+                    FROM reminders
+                    WHERE completed = 0 AND scheduled_time <= ?
+                    ORDER BY scheduled_time
+                    LIMIT ?
+                """,
+                    (datetime.now().isoformat(), limit),
+                )
+                reminders = [dict(row) for row in await cursor.fetchall()]
+                claimed_ids = [r["id"] for r in reminders if not r["is_recurring"]]
+                if claimed_ids:
+                    placeholders = ",".join("?" * len(claimed_ids))
+                    await cursor.execute(
+                        f"UPDATE reminders SET completed = 1 WHERE id IN ({placeholders})",
+                        claimed_ids,
+                    )
+                for reminder in reminders:
+                    reminder["completed"] = 0 if reminder["is_recurring"] else 1
+                return reminders
+        except Exception as e:
+            logger.error(f"Failed to claim pending reminders: {e}")
+            return []
+
+    async def release_reminder_claim(self, reminder_id: int) -> bool:
+        """Return a claimed reminder to the pending queue so it is retried (async)"""
+        try:
+            async with self.get_write_connection() as conn:
+                cursor = await conn.cursor()
+                await cursor.execute(
+                    """
+                    UPDATE reminders SET completed = 0 WHERE id = ?
+                """,
+                    (reminder_id,),
+                )
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Failed to release reminder {reminder_id}: {e}")
+            return False
+
     async def update_recurring_reminder(self, reminder_id: int, next_scheduled_time: datetime) -> bool:
         """Update a recurring reminder with next scheduled time (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1288,7 +1686,7 @@ class Database:
     async def mark_reminder_completed(self, reminder_id: int) -> bool:
         """Mark a reminder as completed (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1304,7 +1702,7 @@ class Database:
     async def delete_reminder(self, reminder_id: int, guild_id: int) -> bool:
         """Delete a reminder (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1323,30 +1721,9 @@ class Database:
     async def get_reminders_for_guild(self, guild_id: int, include_completed: bool = False) -> list[dict]:
         """Get all reminders for a guild (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
-                if include_completed:
-                    await cursor.execute(
-                        """
-                        SELECT id, target_discord_id, creator_discord_id, scheduled_time,
-                               reason, shock_type, intensity, duration, channel_id, completed, created_at
-                        FROM reminders
-                        WHERE guild_id = ?
-                        ORDER BY scheduled_time
-                    """,
-                        (guild_id,),
-                    )
-                else:
-                    await cursor.execute(
-                        """
-                        SELECT id, target_discord_id, creator_discord_id, scheduled_time,
-                               reason, shock_type, intensity, duration, channel_id, completed, created_at
-                        FROM reminders
-                        WHERE guild_id = ? AND completed = 0
-                        ORDER BY scheduled_time
-                    """,
-                        (guild_id,),
-                    )
+                await cursor.execute(_SQL_REMINDERS_BY_GUILD[include_completed], (guild_id,))
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
@@ -1358,30 +1735,11 @@ class Database:
     ) -> list[dict]:
         """Get all reminders created by a specific user in a guild (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
-                if include_completed:
-                    await cursor.execute(
-                        """
-                        SELECT id, target_discord_id, creator_discord_id, scheduled_time,
-                               reason, shock_type, intensity, duration, channel_id, completed, created_at
-                        FROM reminders
-                        WHERE guild_id = ? AND creator_discord_id = ?
-                        ORDER BY scheduled_time
-                    """,
-                        (guild_id, creator_discord_id),
-                    )
-                else:
-                    await cursor.execute(
-                        """
-                        SELECT id, target_discord_id, creator_discord_id, scheduled_time,
-                               reason, shock_type, intensity, duration, channel_id, completed, created_at
-                        FROM reminders
-                        WHERE guild_id = ? AND creator_discord_id = ? AND completed = 0
-                        ORDER BY scheduled_time
-                    """,
-                        (guild_id, creator_discord_id),
-                    )
+                await cursor.execute(
+                    _SQL_REMINDERS_BY_CREATOR[include_completed], (guild_id, creator_discord_id)
+                )
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
@@ -1393,30 +1751,11 @@ class Database:
     ) -> list[dict]:
         """Get all reminders targeting a specific user in a guild (async)."""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
-                if include_completed:
-                    await cursor.execute(
-                        """
-                        SELECT id, target_discord_id, creator_discord_id, scheduled_time,
-                               reason, shock_type, intensity, duration, channel_id, completed, created_at
-                        FROM reminders
-                        WHERE guild_id = ? AND target_discord_id = ?
-                        ORDER BY scheduled_time
-                    """,
-                        (guild_id, target_discord_id),
-                    )
-                else:
-                    await cursor.execute(
-                        """
-                        SELECT id, target_discord_id, creator_discord_id, scheduled_time,
-                               reason, shock_type, intensity, duration, channel_id, completed, created_at
-                        FROM reminders
-                        WHERE guild_id = ? AND target_discord_id = ? AND completed = 0
-                        ORDER BY scheduled_time
-                    """,
-                        (guild_id, target_discord_id),
-                    )
+                await cursor.execute(
+                    _SQL_REMINDERS_FOR_TARGET[include_completed], (guild_id, target_discord_id)
+                )
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
         except Exception as e:
@@ -1428,7 +1767,7 @@ class Database:
     async def get_reminder(self, reminder_id: int, guild_id: int) -> dict | None:
         """Get a specific reminder by ID (async)"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1448,7 +1787,7 @@ class Database:
     async def get_guild_users(self, guild_id: int) -> list[dict]:
         """Get all registered users in a guild"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -1472,7 +1811,7 @@ class Database:
             if not user:
                 return False
 
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 # Delete user (CASCADE will handle shockers, triggers, and controller_permissions)
                 await cursor.execute(
@@ -1481,11 +1820,12 @@ class Database:
                 """,
                     (discord_id, guild_id),
                 )
+                removed = cursor.rowcount > 0
 
-                if cursor.rowcount > 0:
-                    logger.info(f"Removed user {discord_id} from guild {guild_id}")
-                    return True
-                return False
+            self._user_cache.pop((discord_id, guild_id), None)
+            if removed:
+                logger.info(f"Removed user {discord_id} from guild {guild_id}")
+            return removed
         except Exception as e:
             logger.error(f"Failed to remove user {discord_id} from guild {guild_id}: {e}")
             return False
@@ -1508,23 +1848,21 @@ class Database:
                 )
                 return False
 
-            # Get sub user's internal ID
-            sub_user = await self.get_user(sub_discord_id, guild_id)
-            if not sub_user:
-                logger.error(
-                    f"Cannot add controller permission: Sub user {sub_discord_id} not found in guild {guild_id}"
-                )
-                return False
-
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
+                # Resolve the sub user's internal ID inline; no row is inserted if they're unknown
                 await cursor.execute(
                     """
                     INSERT INTO controller_permissions (sub_user_id, controller_discord_id, controller_role_id)
-                    VALUES (?, ?, ?)
+                    SELECT id, ?, ? FROM users WHERE discord_id = ? AND guild_id = ?
                 """,
-                    (sub_user["id"], controller_discord_id, controller_role_id),
+                    (controller_discord_id, controller_role_id, sub_discord_id, guild_id),
                 )
+                if cursor.rowcount == 0:
+                    logger.error(
+                        f"Cannot add controller permission: Sub user {sub_discord_id} not found in guild {guild_id}"
+                    )
+                    return False
 
                 if controller_discord_id:
                     logger.info(
@@ -1548,27 +1886,25 @@ class Database:
     ) -> bool:
         """Remove a controller permission for a Sub user."""
         try:
-            sub_user = await self.get_user(sub_discord_id, guild_id)
-            if not sub_user:
-                return False
-
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 if controller_discord_id:
                     await cursor.execute(
                         """
                         DELETE FROM controller_permissions
-                        WHERE sub_user_id = ? AND controller_discord_id = ?
+                        WHERE sub_user_id = (SELECT id FROM users WHERE discord_id = ? AND guild_id = ?)
+                          AND controller_discord_id = ?
                     """,
-                        (sub_user["id"], controller_discord_id),
+                        (sub_discord_id, guild_id, controller_discord_id),
                     )
                 elif controller_role_id:
                     await cursor.execute(
                         """
                         DELETE FROM controller_permissions
-                        WHERE sub_user_id = ? AND controller_role_id = ?
+                        WHERE sub_user_id = (SELECT id FROM users WHERE discord_id = ? AND guild_id = ?)
+                          AND controller_role_id = ?
                     """,
-                        (sub_user["id"], controller_role_id),
+                        (sub_discord_id, guild_id, controller_role_id),
                     )
                 else:
                     return False
@@ -1588,29 +1924,18 @@ class Database:
     ) -> dict[str, list[int]]:
         """Get all controller permissions for a Sub user."""
         try:
-            sub_user = await self.get_user(sub_discord_id, guild_id)
-            if not sub_user:
-                return {"users": [], "roles": []}
-
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                rows = await conn.execute_fetchall(
                     """
-                    SELECT controller_discord_id, controller_role_id
-                    FROM controller_permissions
-                    WHERE sub_user_id = ?
+                    SELECT cp.controller_discord_id, cp.controller_role_id
+                    FROM controller_permissions cp
+                    JOIN users u ON cp.sub_user_id = u.id
+                    WHERE u.discord_id = ? AND u.guild_id = ?
                 """,
-                    (sub_user["id"],),
+                    (sub_discord_id, guild_id),
                 )
-
-                users = []
-                roles = []
-                async for row in cursor:
-                    if row["controller_discord_id"]:
-                        users.append(row["controller_discord_id"])
-                    if row["controller_role_id"]:
-                        roles.append(row["controller_role_id"])
-
+                users = [r["controller_discord_id"] for r in rows if r["controller_discord_id"]]
+                roles = [r["controller_role_id"] for r in rows if r["controller_role_id"]]
                 return {"users": users, "roles": roles}
         except Exception as e:
             logger.error(f"Failed to get controller permissions: {e}")
@@ -1619,17 +1944,14 @@ class Database:
     async def clear_all_controller_permissions(self, sub_discord_id: int, guild_id: int) -> bool:
         """Clear all controller permissions for a Sub user."""
         try:
-            sub_user = await self.get_user(sub_discord_id, guild_id)
-            if not sub_user:
-                return False
-
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
-                    DELETE FROM controller_permissions WHERE sub_user_id = ?
+                    DELETE FROM controller_permissions
+                    WHERE sub_user_id = (SELECT id FROM users WHERE discord_id = ? AND guild_id = ?)
                 """,
-                    (sub_user["id"],),
+                    (sub_discord_id, guild_id),
                 )
                 logger.info(
                     f"Cleared all controller permissions for {sub_discord_id} in guild {guild_id}"
@@ -1652,38 +1974,28 @@ class Database:
             if controller_discord_id == sub_discord_id:
                 return True
 
-            sub_user = await self.get_user(sub_discord_id, guild_id)
-            if not sub_user:
-                return False
-
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-
-                # Check for direct user permission
-                await cursor.execute(
-                    """
-                    SELECT id FROM controller_permissions
-                    WHERE sub_user_id = ? AND controller_discord_id = ?
-                """,
-                    (sub_user["id"], controller_discord_id),
-                )
-                if await cursor.fetchone():
-                    return True
-
-                # Check for role-based permission
+            async with self.get_read_connection() as conn:
+                # Direct user permission and role-based permission in one lookup
+                role_clause = ""
                 if controller_role_ids:
                     placeholders = ",".join("?" * len(controller_role_ids))
-                    await cursor.execute(
-                        f"""
-                        SELECT id FROM controller_permissions
-                        WHERE sub_user_id = ? AND controller_role_id IN ({placeholders})
-                    """,
-                        (sub_user["id"], *controller_role_ids),
-                    )
-                    if await cursor.fetchone():
-                        return True
-
-                return False
+                    role_clause = f" OR controller_role_id IN ({placeholders})"
+                row = await _fetch_first(
+                    conn,
+                    f"""
+                    SELECT 1 FROM controller_permissions
+                    WHERE sub_user_id = (SELECT id FROM users WHERE discord_id = ? AND guild_id = ?)
+                      AND (controller_discord_id = ?{role_clause})
+                    LIMIT 1
+                """,
+                    (
+                        sub_discord_id,
+                        guild_id,
+                        controller_discord_id,
+                        *(controller_role_ids or ()),
+                    ),
+                )
+                return row is not None
         except Exception as e:
             logger.error(f"Failed to check controller permission: {e}")
             return False
@@ -1703,28 +2015,25 @@ class Database:
             if controller_discord_id == target_discord_id:
                 return True, 0
 
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
-                    SELECT last_control_time, cooldown_seconds
+                    SELECT last_control_epoch, cooldown_seconds
                     FROM controller_cooldowns
                     WHERE controller_discord_id = ? AND target_discord_id = ? AND guild_id = ?
                 """,
                     (controller_discord_id, target_discord_id, guild_id),
                 )
-                row = await cursor.fetchone()
 
-                if not row or not row["last_control_time"]:
+                if not row or not row["last_control_epoch"]:
                     return True, 0  # Never used control, ready to go
 
                 # Use the stored cooldown or the provided default
                 actual_cooldown = (
                     row["cooldown_seconds"] if row["cooldown_seconds"] else cooldown_seconds
                 )
-                last_time = self._parse_db_timestamp(row["last_control_time"])  # UTC-aware
-                now_utc = datetime.now(UTC)
-                seconds_since = (now_utc - last_time).total_seconds()
+                seconds_since = int(time.time()) - row["last_control_epoch"]
 
                 if seconds_since >= actual_cooldown:
                     return True, 0
@@ -1747,23 +2056,34 @@ class Database:
             if controller_discord_id == target_discord_id:
                 return True
 
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
                     INSERT INTO controller_cooldowns
-                        (controller_discord_id, target_discord_id, guild_id, last_control_time, cooldown_seconds)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?)
+                        (controller_discord_id, target_discord_id, guild_id,
+                         last_control_time, last_control_epoch, cooldown_seconds)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?)
                     ON CONFLICT(controller_discord_id, target_discord_id, guild_id) DO UPDATE SET
                         last_control_time = CURRENT_TIMESTAMP,
+                        last_control_epoch = excluded.last_control_epoch,
                         cooldown_seconds = excluded.cooldown_seconds
                 """,
-                    (controller_discord_id, target_discord_id, guild_id, cooldown_seconds),
-                )
-                logger.debug(
-                    f"Updated controller cooldown: {controller_discord_id} -> {target_discord_id} in guild {guild_id}"
+                    (
+                        controller_discord_id,
+                        target_discord_id,
+                        guild_id,
+                        int(time.time()),
+                        cooldown_seconds,
+                    ),
                 )
-                return True
+            # The shock path passes the cached duration back in; only a new value invalidates
+            if self._cooldown_duration_cache.get((target_discord_id, guild_id)) != cooldown_seconds:
+                self._cooldown_duration_cache.pop((target_discord_id, guild_id), None)
+            logger.debug(
+                f"Updated controller cooldown: {controller_discord_id} -> {target_discord_id} in guild {guild_id}"
+            )
+            return True
         except Exception as e:
             logger.error(f"Failed to update controller cooldown: {e}")
             return False
@@ -1773,7 +2093,7 @@ class Database:
     ) -> bool:
         """Set the cooldown duration for all controllers of a specific target user."""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 # Update all existing cooldown records for this target
                 await cursor.execute(
@@ -1784,20 +2104,24 @@ class Database:
                 """,
                     (cooldown_seconds, target_discord_id, guild_id),
                 )
-                logger.info(
-                    f"Set controller cooldown duration to {cooldown_seconds}s for target {target_discord_id} in guild {guild_id}"
-                )
-                return True
+            self._cooldown_duration_cache.pop((target_discord_id, guild_id), None)
+            logger.info(
+                f"Set controller cooldown duration to {cooldown_seconds}s for target {target_discord_id} in guild {guild_id}"
+            )
+            return True
         except Exception as e:
             logger.error(f"Failed to set controller cooldown duration: {e}")
             return False
 
     async def get_controller_cooldown_duration(self, target_discord_id: int, guild_id: int) -> int:
         """Get the configured cooldown duration for a target user."""
+        cached = self._cooldown_duration_cache.get((target_discord_id, guild_id))
+        if cached is not None:
+            return cached
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT cooldown_seconds
                     FROM controller_cooldowns
@@ -1806,8 +2130,10 @@ class Database:
                 """,
                     (target_discord_id, guild_id),
                 )
-                row = await cursor.fetchone()
-                return row["cooldown_seconds"] if row else 300  # Default: 5 minutes
+            duration = row["cooldown_seconds"] if row else 300  # Default: 5 minutes
+            if self._tx_conn.get() is None:
+                self._cooldown_duration_cache[(target_discord_id, guild_id)] = duration
+            return duration
         except Exception as e:
             logger.error(f"Failed to get controller cooldown duration: {e}")
             return 300  # Default: 5 minutes
@@ -1832,52 +2158,68 @@ class Database:
         source: str = "manual",
         metadata: str = None,
     ) -> bool:
-        """Log a controller action for audit trail purposes."""
+        """Log a controller action for audit trail purposes.
+
+        The row is buffered and written in a batch by flush_logs(); readers of the
+        action log flush first, so they always see every logged action.
+        """
         try:
             # Don't store raw shocker_id for privacy - store only last 4 chars or hash
             safe_shocker_id = None
             if shocker_id:
                 safe_shocker_id = f"...{shocker_id[-4:]}" if len(shocker_id) > 4 else "****"
 
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
-                    """
-                    INSERT INTO controller_action_logs (
-                        guild_id, controller_discord_id, controller_username,
-                        target_discord_id, target_username, action_type,
-                        shock_type, intensity, duration, shocker_id, shocker_name,
-                        success, error_message, source, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        guild_id,
-                        controller_discord_id,
-                        controller_username,
-                        target_discord_id,
-                        target_username,
-                        action_type,
-                        shock_type,
-                        intensity,
-                        duration,
-                        safe_shocker_id,
-                        shocker_name,
-                        success,
-                        error_message,
-                        source,
-                        metadata,
-                    ),
+            self._log_buffer.append(
+                (
+                    guild_id,
+                    controller_discord_id,
+                    controller_username,
+                    target_discord_id,
+                    target_username,
+                    action_type,
+                    shock_type,
+                    intensity,
+                    duration,
+                    safe_shocker_id,
+                    shocker_name,
+                    success,
+                    error_message,
+                    source,
+                    metadata,
+                    int(time.time()),
                 )
-
-                logger.debug(
-                    f"Logged action: {action_type} by {controller_username} on {target_username} "
-                    f"in guild {guild_id} - Success: {success}"
-                )
-                return True
+            )
+            logger.debug(
+                f"Queued action log: {action_type} by {controller_username} on {target_username} "
+                f"in guild {guild_id} - Success: {success}"
+            )
+            if len(self._log_buffer) >= _LOG_FLUSH_MAX_ROWS:
+                return await self.flush_logs()
+            return True
         except Exception as e:
             logger.error(f"Failed to log controller action: {e}", exc_info=True)
             return False
 
+    async def flush_logs(self) -> bool:
+        """Write all buffered action logs in a single transaction"""
+        if not self._log_buffer:
+            return True
+        rows, self._log_buffer = self._log_buffer, []
+        try:
+            async with self.transaction() as conn:
+                await conn.executemany(_SQL_INSERT_ACTION_LOG, rows)
+            logger.debug(f"Flushed {len(rows)} action log(s)")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to flush {len(rows)} controller action log(s): {e}", exc_info=True)
+            return False
+
+    async def _log_flush_loop(self) -> None:
+        """Background task periodically draining the action log buffer"""
+        while True:
+            await asyncio.sleep(_LOG_FLUSH_INTERVAL)
+            await self.flush_logs()
+
     async def get_action_logs_for_target(
         self,
         target_discord_id: int,
@@ -1885,109 +2227,101 @@ class Database:
         limit: int = 100,
         offset: int = 0,
         days: int = None,
+        before: tuple[int, int] | None = None,
     ) -> list[dict]:
-        """Get action logs for a specific target user."""
-        try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-
-                if days:
-                    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-                    await cursor.execute(
-                        """
-                        SELECT id, guild_id, controller_discord_id, controller_username,
-                               target_discord_id, target_username, action_type,
-                               shock_type, intensity, duration, shocker_id, shocker_name,
-                               success, error_message, source, metadata, timestamp
-                        FROM controller_action_logs
-                        WHERE target_discord_id = ? AND guild_id = ? AND timestamp >= ?
-                        ORDER BY timestamp DESC
-                        LIMIT ? OFFSET ?
-                    """,
-                        (target_discord_id, guild_id, cutoff_date, limit, offset),
-                    )
-                else:
-                    await cursor.execute(
-                        """
-                        SELECT id, guild_id, controller_discord_id, controller_username,
-                               target_discord_id, target_username, action_type,
-                               shock_type, intensity, duration, shocker_id, shocker_name,
-                               success, error_message, source, metadata, timestamp
-                        FROM controller_action_logs
-                        WHERE target_discord_id = ? AND guild_id = ?
-                        ORDER BY timestamp DESC
-                        LIMIT ? OFFSET ?
-                    """,
-                        (target_discord_id, guild_id, limit, offset),
-                    )
+        """Get action logs for a specific target user, newest first.
 
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
+        Pass the (timestamp_epoch, id) of the last row of a page as ``before`` to fetch
+        the next page by keyset instead of ``offset``.
+        """
+        await self.flush_logs()
+        try:
+            return await self._get_action_logs(
+                "target_discord_id", target_discord_id, guild_id, limit, offset, days, before
+            )
         except Exception as e:
             logger.error(f"Failed to get action logs for target {target_discord_id}: {e}")
             return []
 
     async def get_action_logs_by_controller(
-        self, controller_discord_id: int, guild_id: int, limit: int = 100, offset: int = 0, days: int = None
+        self,
+        controller_discord_id: int,
+        guild_id: int,
+        limit: int = 100,
+        offset: int = 0,
+        days: int = None,
+        before: tuple[int, int] | None = None,
     ) -> list[dict]:
-        """Get action logs for a specific controller."""
+        """Get action logs for a specific controller, newest first (see get_action_logs_for_target)."""
+        await self.flush_logs()
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-
-                if days:
-                    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-                    await cursor.execute(
-                        """
-                        SELECT id, guild_id, controller_discord_id, controller_username,
-                               target_discord_id, target_username, action_type,
-                               shock_type, intensity, duration, shocker_id, shocker_name,
-                               success, error_message, source, metadata, timestamp
-                        FROM controller_action_logs
-                        WHERE controller_discord_id = ? AND guild_id = ? AND timestamp >= ?
-                        ORDER BY timestamp DESC
-                        LIMIT ? OFFSET ?
-                    """,
-                        (controller_discord_id, guild_id, cutoff_date, limit, offset),
-                    )
-                else:
-                    await cursor.execute(
-                        """
-                        SELECT id, guild_id, controller_discord_id, controller_username,
-                               target_discord_id, target_username, action_type,
-                               shock_type, intensity, duration, shocker_id, shocker_name,
-                               success, error_message, source, metadata, timestamp
-                        FROM controller_action_logs
-                        WHERE controller_discord_id = ? AND guild_id = ?
-                        ORDER BY timestamp DESC
-                        LIMIT ? OFFSET ?
-                    """,
-                        (controller_discord_id, guild_id, limit, offset),
-                    )
-
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
+            return await self._get_action_logs(
+                "controller_discord_id", controller_discord_id, guild_id, limit, offset, days, before
+            )
         except Exception as e:
             logger.error(f"Failed to get action logs by controller {controller_discord_id}: {e}")
             return []
 
+    async def _get_action_logs(
+        self,
+        key_column: str,
+        key_value: int,
+        guild_id: int,
+        limit: int,
+        offset: int,
+        days: int | None,
+        before: tuple[int, int] | None,
+    ) -> list[dict]:
+        """Shared page query for the get_action_logs_* methods.
+
+        ``(timestamp_epoch, id)`` is the keyset: timestamps have one-second resolution,
+        so the id breaks ties between rows logged in the same second.
+        """
+        conditions = [f"{key_column} = ?", "guild_id = ?"]
+        params: list = [key_value, guild_id]
+        if days:
+            conditions.append("timestamp_epoch >= ?")
+            params.append(int(time.time()) - days * 86400)
+        if before is not None:
+            conditions.append("(timestamp_epoch, id) < (?, ?)")
+            params.extend(before)
+            offset = 0
+
+        async with self.get_read_connection() as conn:
+            cursor = await conn.cursor()
+            await cursor.execute(
+                f"""
+                SELECT id, guild_id, controller_discord_id, controller_username,
+                       target_discord_id, target_username, action_type,
+                       shock_type, intensity, duration, shocker_id, shocker_name,
+                       success, error_message, source, metadata, timestamp, timestamp_epoch
+                FROM controller_action_logs
+                WHERE {" AND ".join(conditions)}
+                ORDER BY timestamp_epoch DESC, id DESC
+                LIMIT ? OFFSET ?
+            """,
+                (*params, limit, offset),
+            )
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
     async def get_action_log_count(
         self, target_discord_id: int, guild_id: int, days: int = None
     ) -> int:
         """Get the total count of action logs for a target user."""
+        await self.flush_logs()
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
 
                 if days:
-                    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
                     await cursor.execute(
                         """
                         SELECT COUNT(*) as count
                         FROM controller_action_logs
-                        WHERE target_discord_id = ? AND guild_id = ? AND timestamp >= ?
+                        WHERE target_discord_id = ? AND guild_id = ? AND timestamp_epoch >= ?
                     """,
-                        (target_discord_id, guild_id, cutoff_date),
+                        (target_discord_id, guild_id, int(time.time()) - days * 86400),
                     )
                 else:
                     await cursor.execute(
@@ -2006,36 +2340,54 @@ class Database:
             return 0
 
     async def delete_old_action_logs(self, days: int = 90) -> int:
-        """Delete action logs older than the specified number of days."""
+        """Delete action logs older than the specified number of days.
+
+        Rows are deleted in chunks of _LOG_DELETE_CHUNK, each in its own transaction,
+        so the write lock is released between chunks and the WAL stays small.
+        """
+        await self.flush_logs()
         try:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
-                    """
-                    DELETE FROM controller_action_logs
-                    WHERE timestamp < ?
-                """,
-                    (cutoff_date,),
-                )
-                deleted_count = cursor.rowcount
-                if deleted_count > 0:
-                    logger.info(f"Deleted {deleted_count} action logs older than {days} days")
-                return deleted_count
+            cutoff_epoch = int(time.time()) - days * 86400
+            deleted_count = 0
+            while True:
+                async with self.get_write_connection() as conn:
+                    cursor = await conn.cursor()
+                    await cursor.execute(
+                        """
+                        DELETE FROM controller_action_logs
+                        WHERE id IN (
+                            SELECT id FROM controller_action_logs WHERE timestamp_epoch < ? LIMIT ?
+                        )
+                    """,
+                        (cutoff_epoch, _LOG_DELETE_CHUNK),
+                    )
+                    chunk_deleted = cursor.rowcount
+                deleted_count += chunk_deleted
+                if chunk_deleted < _LOG_DELETE_CHUNK:
+                    break
+
+            if deleted_count > 0:
+                # Reclaim the WAL space used by the deletes
+                async with self.get_write_connection() as conn:
+                    await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                logger.info(f"Deleted {deleted_count} action logs older than {days} days")
+            return deleted_count
         except Exception as e:
             logger.error(f"Failed to delete old action logs: {e}")
             return 0
 
-    # Controller Preferences Methods (Smart Defaults)
-
     async def get_controller_preferences(
         self, controller_discord_id: int, guild_id: int, target_discord_id: int = None
     ) -> dict | None:
         """Get controller preferences (defaults and last-used values)"""
+        cached = self._prefs_cache.get((controller_discord_id, guild_id))
+        if cached is not None and target_discord_id in cached:
+            prefs = cached[target_discord_id]
+            return dict(prefs) if prefs else None
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT * FROM controller_preferences
                     WHERE controller_discord_id = ? AND guild_id = ? AND
@@ -2045,8 +2397,12 @@ class Database:
                 """,
                     (controller_discord_id, guild_id, target_discord_id),
                 )
-                row = await cursor.fetchone()
-                return dict(row) if row else None
+            prefs = dict(row) if row else None
+            if self._tx_conn.get() is None:
+                if cached is None:
+                    cached = self._prefs_cache[(controller_discord_id, guild_id)] = {}
+                cached[target_discord_id] = prefs
+            return dict(prefs) if prefs else None
         except Exception as e:
             logger.error(f"Failed to get controller preferences: {e}")
             return None
@@ -2063,7 +2419,7 @@ class Database:
     ) -> bool:
         """Set default preferences for a controller"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -2088,10 +2444,9 @@ class Database:
                         use_smart_defaults,
                     ),
                 )
-                logger.info(
-                    f"Set controller defaults for {controller_discord_id} in guild {guild_id}"
-                )
-                return True
+            self._prefs_cache.pop((controller_discord_id, guild_id), None)
+            logger.info(f"Set controller defaults for {controller_discord_id} in guild {guild_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to set controller defaults: {e}")
             return False
@@ -2107,34 +2462,36 @@ class Database:
     ) -> bool:
         """Update the last-used values for a controller"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
-                # Update both specific target and general preferences
-                for target_id in [target_discord_id, None]:
-                    await cursor.execute(
-                        """
-                        INSERT INTO controller_preferences
-                            (controller_discord_id, guild_id, target_discord_id,
-                             last_used_intensity, last_used_duration, last_used_shock_type, last_used_target_id)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(controller_discord_id, guild_id, target_discord_id) DO UPDATE SET
-                            last_used_intensity = excluded.last_used_intensity,
-                            last_used_duration = excluded.last_used_duration,
-                            last_used_shock_type = excluded.last_used_shock_type,
-                            last_used_target_id = excluded.last_used_target_id,
-                            updated_at = CURRENT_TIMESTAMP
-                    """,
-                        (
-                            controller_discord_id,
-                            guild_id,
-                            target_id,
-                            intensity,
-                            duration,
-                            shock_type,
-                            target_discord_id,
-                        ),
-                    )
-                return True
+                # Update both specific target and general preferences in one statement
+                values = (intensity, duration, shock_type, target_discord_id)
+                await cursor.execute(
+                    """
+                    INSERT INTO controller_preferences
+                        (controller_discord_id, guild_id, target_discord_id,
+                         last_used_intensity, last_used_duration, last_used_shock_type, last_used_target_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?), (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(controller_discord_id, guild_id, target_discord_id) DO UPDATE SET
+                        last_used_intensity = excluded.last_used_intensity,
+                        last_used_duration = excluded.last_used_duration,
+                        last_used_shock_type = excluded.last_used_shock_type,
+                        last_used_target_id = excluded.last_used_target_id,
+                        updated_at = CURRENT_TIMESTAMP
+                """,
+                    (
+                        controller_discord_id,
+                        guild_id,
+                        target_discord_id,
+                        *values,
+                        controller_discord_id,
+                        guild_id,
+                        None,
+                        *values,
+                    ),
+                )
+            self._prefs_cache.pop((controller_discord_id, guild_id), None)
+            return True
         except Exception as e:
             logger.error(f"Failed to update last used values: {e}")
             return False
@@ -2144,7 +2501,7 @@ class Database:
     ) -> list[int]:
         """Get list of Discord IDs that a controller can control in a guild"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_read_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -2170,15 +2527,14 @@ class Database:
     async def get_device_worn_status(self, discord_id: int, guild_id: int) -> bool:
         """Get whether a user's device is worn"""
         try:
-            async with self.get_connection() as conn:
-                cursor = await conn.cursor()
-                await cursor.execute(
+            async with self.get_read_connection() as conn:
+                row = await _fetch_first(
+                    conn,
                     """
                     SELECT device_worn FROM users WHERE discord_id = ? AND guild_id = ?
                 """,
                     (discord_id, guild_id),
                 )
-                row = await cursor.fetchone()
                 if row:
                     # SQLite stores booleans as 0 or 1
                     return bool(row["device_worn"])
@@ -2190,7 +2546,7 @@ class Database:
     async def set_device_worn(self, discord_id: int, guild_id: int, is_worn: bool) -> bool:
         """Update whether a user's device is worn"""
         try:
-            async with self.get_connection() as conn:
+            async with self.get_write_connection() as conn:
                 cursor = await conn.cursor()
                 await cursor.execute(
                     """
@@ -2199,10 +2555,12 @@ class Database:
                 """,
                     (1 if is_worn else 0, discord_id, guild_id),
                 )
-                if cursor.rowcount > 0:
-                    logger.info(f"Updated device_worn to {is_worn} for user {discord_id} in guild {guild_id}")
-                    return True
-                return False
+                updated = cursor.rowcount > 0
+
+            self._user_cache.pop((discord_id, guild_id), None)
+            if updated:
+                logger.info(f"Updated device_worn to {is_worn} for user {discord_id} in guild {guild_id}")
+            return updated
         except Exception as e:
             logger.error(f"Failed to set device_worn status for user {discord_id}: {e}")
             return False
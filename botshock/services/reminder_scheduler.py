@@ -55,8 +55,8 @@ class ReminderScheduler:
     async def _check_and_execute_reminders(self) -> None:
         """Check for due reminders and execute them"""
         try:
-            # get_pending_reminders is async and uses aiosqlite
-            pending_reminders = await self.db.get_pending_reminders()
+            # Non-recurring reminders come back already marked completed (atomic claim)
+            pending_reminders = await self.db.claim_pending_reminders()
 
             for reminder in pending_reminders:
                 try:
@@ -66,13 +66,19 @@ class ReminderScheduler:
                         f"Failed to execute reminder {reminder.get('id')}: {e}", exc_info=True
                     )
                     # Mark as completed even on error to prevent retry loops
-                    try:
-                        await self.db.mark_reminder_completed(reminder["id"])
-                    except Exception:
-                        logger.exception("Failed to mark reminder completed after execution error")
+                    await self._mark_completed(reminder, "after execution error")
         except Exception as e:
             logger.error(f"Error checking pending reminders: {e}", exc_info=True)
 
+    async def _mark_completed(self, reminder: dict, context: str) -> None:
+        """Mark a reminder completed unless claim_pending_reminders already did"""
+        if reminder.get("completed"):
+            return
+        try:
+            await self.db.mark_reminder_completed(reminder["id"])
+        except Exception:
+            logger.exception(f"Failed to mark reminder completed {context}")
+
     async def _execute_reminder(self, reminder: dict) -> None:
         """Execute a single reminder"""
         reminder_id = reminder["id"]
@@ -92,10 +98,7 @@ class ReminderScheduler:
         guild = self.bot.get_guild(guild_id)
         if not guild:
             logger.warning(f"Guild {guild_id} not found for reminder {reminder_id}")
-            try:
-                await self.db.mark_reminder_completed(reminder_id)
-            except Exception:
-                logger.exception("Failed to mark reminder completed when guild missing")
+            await self._mark_completed(reminder, "when guild missing")
             return
 
         # Get target user (async)
@@ -104,10 +107,7 @@ class ReminderScheduler:
             logger.warning(
                 f"Target user {target_id} not registered in guild {guild_id} for reminder {reminder_id}"
             )
-            try:
-                await self.db.mark_reminder_completed(reminder_id)
-            except Exception:
-                logger.exception("Failed to mark reminder completed when user missing")
+            await self._mark_completed(reminder, "when user missing")
             return
 
         # Get shockers (async)
@@ -116,10 +116,7 @@ class ReminderScheduler:
             logger.warning(
                 f"Target user {target_id} has no shockers in guild {guild_id} for reminder {reminder_id}"
             )
-            try:
-                await self.db.mark_reminder_completed(reminder_id)
-            except Exception:
-                logger.exception("Failed to mark reminder completed when no shockers")
+            await self._mark_completed(reminder, "when no shockers")
             return
 
         # Use first shocker
@@ -134,6 +131,9 @@ class ReminderScheduler:
             logger.info(
                 f"Reminder {reminder_id} postponed - device on cooldown. Will retry in next cycle."
             )
+            if reminder.get("completed"):
+                # Undo the claim so the next cycle picks it up again
+                await self.db.release_reminder_claim(reminder_id)
             return  # Don't mark as completed, will retry
 
         # Send the shock
@@ -168,20 +168,14 @@ class ReminderScheduler:
             if is_recurring and recurrence_pattern:
                 await self._schedule_next_occurrence(reminder)
             else:
-                # Mark as completed for non-recurring (async)
-                try:
-                    await self.db.mark_reminder_completed(reminder_id)
-                except Exception:
-                    logger.exception("Failed to mark non-recurring reminder completed")
+                # Mark as completed for non-recurring (no-op when already claimed)
+                await self._mark_completed(reminder, "for non-recurring reminder")
         else:
             logger.error(
                 f"Reminder shock failed - Reminder: {reminder_id} - Status: {status_code} - Response: {response_text}"
             )
             # Mark as completed to prevent infinite retries (async)
-            try:
-                await self.db.mark_reminder_completed(reminder_id)
-            except Exception:
-                logger.exception("Failed to mark reminder completed after failed shock")
+            await self._mark_completed(reminder, "after failed shock")
 
     async def _schedule_next_occurrence(self, reminder: dict) -> None:
         """Schedule the next occurrence of a recurring reminder"""
@@ -195,10 +189,7 @@ class ReminderScheduler:
                 logger.error(
                     f"Invalid recurrence pattern for reminder {reminder_id}: {recurrence_pattern}"
                 )
-                try:
-                    await self.db.mark_reminder_completed(reminder_id)
-                except Exception:
-                    logger.exception("Failed to mark reminder completed for invalid recurrence")
+                await self._mark_completed(reminder, "for invalid recurrence")
                 return
 
             # Get original scheduled time (for time of day reference)
@@ -223,21 +214,13 @@ class ReminderScheduler:
                     logger.error(f"Failed to update recurring reminder {reminder_id}")
             else:
                 logger.error(f"Could not calculate next occurrence for reminder {reminder_id}")
-                try:
-                    await self.db.mark_reminder_completed(reminder_id)
-                except Exception:
-                    logger.exception(
-                        "Failed to mark reminder completed when next occurrence not found"
-                    )
+                await self._mark_completed(reminder, "when next occurrence not found")
 
         except Exception as e:
             logger.error(
                 f"Error scheduling next occurrence for reminder {reminder_id}: {e}", exc_info=True
             )
-            try:
-                await self.db.mark_reminder_completed(reminder_id)
-            except Exception:
-                logger.exception("Failed to mark reminder completed after scheduling error")
+            await self._mark_completed(reminder, "after scheduling error")
 
     @staticmethod
     async def _send_notification(
@@ -3,6 +3,7 @@ Encryption utilities for sensitive data with enhanced security
 """
 
 import base64
+import functools
 import hashlib
 import logging
 
@@ -46,8 +47,13 @@ class EncryptionHandler:
         self._key_cache = {}
 
     @staticmethod
+    @functools.lru_cache(maxsize=8)
     def _derive_key(password: str) -> bytes:
-        """Derive a Fernet key from a password"""
+        """Derive a Fernet key from a password
+
+        PBKDF2 is deliberately slow (100k iterations), so results are memoized per
+        password; every handler built from the same key reuses the derived bytes.
+        """
         # Use a fixed salt (for deterministic derivation across runs/tests)
         # In production, consider a configurable or stored salt.
         salt = b"botshock_salt_v2_"
@@ -0,0 +1,38 @@
+from botshock.utils import cache
+from botshock.utils.cache import TTLCache
+
+
+def test_evicts_least_recently_used():
+    lru = TTLCache(maxsize=2, ttl=60)
+    lru["a"] = 1
+    lru["b"] = 2
+    assert lru.get("a") == 1  # "b" is now least recently used
+    lru["c"] = 3
+
+    assert "b" not in lru
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    ttl_cache = TTLCache(maxsize=10, ttl=5)
+    ttl_cache["key"] = "value"
+
+    now += 4
+    assert ttl_cache.get("key") == "value"
+    now += 2
+    assert ttl_cache.get("key", "missing") == "missing"
+    assert len(ttl_cache) == 0
+
+
+def test_pop_and_clear():
+    ttl_cache = TTLCache(maxsize=10, ttl=60)
+    ttl_cache["a"] = 1
+    ttl_cache["b"] = 2
+
+    assert ttl_cache.pop("a") == 1
+    assert ttl_cache.pop("a", "gone") == "gone"
+    ttl_cache.clear()
+    assert len(ttl_cache) == 0
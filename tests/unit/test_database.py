@@ -0,0 +1,261 @@
+import sqlite3
+
+import pytest
+
+from botshock.core import database
+from botshock.core.database import Database
+
+
+@pytest.mark.asyncio
+async def test_add_triggers_bulk_returns_ids(real_bot):
+    db = real_bot.db
+    guild_id = 5001
+    user_id = 6001
+    assert await db.add_user(user_id, guild_id, "bulk-user", "token-abc")
+
+    ids = await db.add_triggers_bulk(
+        user_id,
+        guild_id,
+        [
+            ("hello", "greet", "Shock", 10, 500, 30),
+            ("bye", None, "Vibrate", 20, 1000, 60),
+        ],
+    )
+
+    assert len(ids) == 2
+    triggers = await db.get_triggers(user_id, guild_id)
+    assert {t["id"] for t in triggers} == set(ids)
+    assert {t["regex_pattern"] for t in triggers} == {"hello", "bye"}
+
+
+@pytest.mark.asyncio
+async def test_add_shockers_bulk_unknown_user(real_bot):
+    db = real_bot.db
+    assert await db.add_shockers_bulk(404, 5002, [("abc", "A")]) == []
+
+
+@pytest.mark.asyncio
+async def test_add_shockers_bulk_upserts_names(real_bot):
+    db = real_bot.db
+    guild_id = 5003
+    user_id = 6003
+    assert await db.add_user(user_id, guild_id, "bulk-user", "token-abc")
+
+    stored = await db.add_shockers_bulk(user_id, guild_id, [("s1", "One"), ("s2", None)])
+    assert stored == ["s1", "s2"]
+    await db.add_shockers_bulk(user_id, guild_id, [("s2", "Two")])
+
+    shockers = {s["shocker_id"]: s["shocker_name"] for s in await db.get_shockers(user_id, guild_id)}
+    assert shockers == {"s1": "One", "s2": "Two"}
+
+
+@pytest.mark.asyncio
+async def test_add_trigger_returns_new_id(real_bot):
+    db = real_bot.db
+    guild_id = 5004
+    user_id = 6004
+    assert await db.add_user(user_id, guild_id, "trigger-user", "token-abc")
+
+    first = await db.add_trigger(user_id, guild_id, "foo")
+    second = await db.add_trigger(user_id, guild_id, "bar")
+
+    assert isinstance(first, int) and second == first + 1
+
+
+@pytest.mark.asyncio
+async def test_disk_database_reads_use_read_only_pool(tmp_path, mock_config):
+    db = Database(
+        db_path=str(tmp_path / "pool.db"), encryption_key=mock_config.encryption_key, pool_size=2
+    )
+    await db.initialize()
+    try:
+        assert await db.add_user(7001, 5005, "pool-user", "token-abc")
+        user = await db.get_user(7001, 5005)
+        assert user["discord_username"] == "pool-user"
+
+        async with db.get_read_connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                await conn.execute("DELETE FROM users")
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_can_user_control_user_and_role_permissions(real_bot):
+    db = real_bot.db
+    guild_id = 5006
+    sub_id = 6006
+    assert await db.add_user(sub_id, guild_id, "sub-user", "token-abc")
+    assert await db.add_controller_permission(sub_id, guild_id, controller_discord_id=111)
+    assert await db.add_controller_permission(sub_id, guild_id, controller_role_id=222)
+
+    assert await db.can_user_control(111, sub_id, guild_id)
+    assert await db.can_user_control(333, sub_id, guild_id, controller_role_ids=[999, 222])
+    assert not await db.can_user_control(333, sub_id, guild_id)
+    assert not await db.can_user_control(333, sub_id, guild_id, controller_role_ids=[999])
+
+
+@pytest.mark.asyncio
+async def test_controller_permissions_unknown_sub_user(real_bot):
+    db = real_bot.db
+    assert not await db.add_controller_permission(404, 5007, controller_discord_id=111)
+    assert not await db.remove_controller_permission(404, 5007, controller_discord_id=111)
+    assert await db.get_controller_permissions(404, 5007) == {"users": [], "roles": []}
+    assert not await db.can_user_control(111, 404, 5007)
+
+
+@pytest.mark.asyncio
+async def test_update_last_used_values_writes_target_and_general(real_bot):
+    db = real_bot.db
+    guild_id = 5008
+    assert await db.update_last_used_values(111, guild_id, 222, 40, 1500, "Vibrate")
+
+    specific = await db.get_controller_preferences(111, guild_id, 222)
+    general = await db.get_controller_preferences(111, guild_id)
+    assert specific["target_discord_id"] == 222
+    assert general["target_discord_id"] is None
+    for prefs in (specific, general):
+        assert prefs["last_used_intensity"] == 40
+        assert prefs["last_used_target_id"] == 222
+
+
+@pytest.mark.asyncio
+async def test_log_controller_action_is_buffered_until_read(real_bot):
+    db = real_bot.db
+    guild_id = 5009
+    for _ in range(3):
+        assert await db.log_controller_action(guild_id, 111, "ctrl", 222, "sub", "shock")
+    assert len(db._log_buffer) == 3
+
+    assert await db.get_action_log_count(222, guild_id) == 3
+    assert db._log_buffer == []
+
+
+@pytest.mark.asyncio
+async def test_get_user_cache_invalidated_on_update(real_bot):
+    db = real_bot.db
+    guild_id = 5010
+    user_id = 6010
+    assert await db.add_user(user_id, guild_id, "before", "token-abc")
+    assert (await db.get_user(user_id, guild_id))["discord_username"] == "before"
+    assert (user_id, guild_id) in db._user_cache
+
+    assert await db.add_user(user_id, guild_id, "after", "token-abc")
+    assert (await db.get_user(user_id, guild_id))["discord_username"] == "after"
+
+    assert await db.remove_user(user_id, guild_id)
+    assert await db.get_user(user_id, guild_id) is None
+
+
+@pytest.mark.asyncio
+async def test_controller_cooldown_uses_epoch_seconds(real_bot):
+    db = real_bot.db
+    guild_id = 5011
+    assert await db.check_controller_cooldown(111, 222, guild_id) == (True, 0)
+
+    assert await db.update_controller_cooldown(111, 222, guild_id, cooldown_seconds=60)
+    ready, remaining = await db.check_controller_cooldown(111, 222, guild_id)
+    assert not ready
+    assert 59 <= remaining <= 60
+
+
+def test_migration_backfills_last_control_epoch(tmp_path, mock_config):
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute(
+        """
+        CREATE TABLE controller_cooldowns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            controller_discord_id INTEGER NOT NULL,
+            target_discord_id INTEGER NOT NULL,
+            guild_id INTEGER NOT NULL,
+            last_control_time TIMESTAMP NOT NULL,
+            cooldown_seconds INTEGER NOT NULL DEFAULT 300,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(controller_discord_id, target_discord_id, guild_id)
+        )
+        """
+    )
+    legacy.execute(
+        "INSERT INTO controller_cooldowns (controller_discord_id, target_discord_id, guild_id, "
+        "last_control_time) VALUES (1, 2, 3, '2024-01-01 00:00:00')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    Database(db_path=str(path), encryption_key=mock_config.encryption_key).init_database()
+
+    with sqlite3.connect(path) as conn:
+        (epoch,) = conn.execute("SELECT last_control_epoch FROM controller_cooldowns").fetchone()
+    assert epoch == 1704067200
+
+
+@pytest.mark.asyncio
+async def test_action_logs_keyset_pagination(real_bot):
+    db = real_bot.db
+    guild_id = 5012
+    for _ in range(5):
+        await db.log_controller_action(guild_id, 111, "ctrl", 222, "sub", "shock")
+
+    seen = []
+    before = None
+    while page := await db.get_action_logs_for_target(222, guild_id, limit=2, before=before):
+        seen.extend(log["id"] for log in page)
+        before = (page[-1]["timestamp"], page[-1]["id"])
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_delete_old_action_logs_in_chunks(real_bot, monkeypatch):
+    monkeypatch.setattr(database, "_LOG_DELETE_CHUNK", 2)
+    db = real_bot.db
+    guild_id = 5013
+    for _ in range(5):
+        await db.log_controller_action(guild_id, 111, "ctrl", 222, "sub", "shock")
+    await db.log_controller_action(guild_id, 111, "ctrl", 222, "sub", "recent")
+    await db.flush_logs()
+    async with db.get_write_connection() as conn:
+        await conn.execute(
+            "UPDATE controller_action_logs SET timestamp = '2000-01-01 00:00:00' "
+            "WHERE action_type = 'shock'"
+        )
+
+    assert await db.delete_old_action_logs(days=30) == 5
+    assert await db.get_action_log_count(222, guild_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back_grouped_writes(real_bot):
+    db = real_bot.db
+    guild_id = 5014
+    with pytest.raises(RuntimeError):
+        async with db.transaction():
+            assert await db.add_user(6014, guild_id, "tx-user", "token-abc")
+            # Reads inside the block see the uncommitted write
+            assert await db.get_user(6014, guild_id) is not None
+            raise RuntimeError("abort")
+
+    assert await db.get_user(6014, guild_id) is None
+
+    async with db.transaction():
+        assert await db.add_user(6014, guild_id, "tx-user", "token-abc")
+        async with db.transaction():
+            assert await db.add_controller_permission(6014, guild_id, controller_discord_id=111)
+
+    assert await db.can_user_control(111, 6014, guild_id)
+
+
+@pytest.mark.asyncio
+async def test_cooldown_duration_and_preferences_cache_invalidation(real_bot):
+    db = real_bot.db
+    guild_id = 5015
+    assert await db.update_controller_cooldown(111, 222, guild_id, cooldown_seconds=120)
+    assert await db.get_controller_cooldown_duration(222, guild_id) == 120
+    assert await db.set_controller_cooldown_duration(222, guild_id, 45)
+    assert await db.get_controller_cooldown_duration(222, guild_id) == 45
+
+    assert await db.get_controller_preferences(111, guild_id, 222) is None
+    assert await db.update_last_used_values(111, guild_id, 222, 40, 1500, "Vibrate")
+    assert (await db.get_controller_preferences(111, guild_id, 222))["last_used_intensity"] == 40
@@ -109,7 +109,7 @@ class TestReminderScheduler:
     async def test_scheduler_checks_reminders(self):
         """Test scheduler checks for pending reminders."""
         db = AsyncMock()
-        db.get_pending_reminders = AsyncMock(return_value=[])
+        db.claim_pending_reminders = AsyncMock(return_value=[])
         
         scheduler = ReminderScheduler(Mock(), db, Mock())
 
@@ -117,7 +117,7 @@ class TestReminderScheduler:
         await scheduler._check_and_execute_reminders()
         
         # Verify it checked for pending reminders
-        db.get_pending_reminders.assert_called_once()
+        db.claim_pending_reminders.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_scheduler_handles_execution_errors(self):
@@ -137,7 +137,7 @@ class TestReminderScheduler:
     async def test_scheduler_handles_loop_errors(self):
         """Test scheduler handles errors in the main loop."""
         db = AsyncMock()
-        db.get_pending_reminders = AsyncMock(side_effect=Exception("Database error"))
+        db.claim_pending_reminders = AsyncMock(side_effect=Exception("Database error"))
         
         scheduler = ReminderScheduler(Mock(), db, Mock())
 
@@ -177,6 +177,28 @@ class TestReminderExecution:
         # Should mark as completed even if guild is missing
         db.mark_reminder_completed.assert_called_with(1)
 
+    @pytest.mark.asyncio
+    async def test_claimed_reminder_skips_completion_write(self):
+        """Test reminders already claimed as completed are not marked again."""
+        bot = Mock()
+        bot.get_guild = Mock(return_value=None)
+
+        db = AsyncMock()
+        scheduler = ReminderScheduler(bot, db, Mock())
+
+        reminder = {
+            "id": 1,
+            "guild_id": 999,
+            "target_discord_id": 456,
+            "creator_discord_id": 789,
+            "is_recurring": False,
+            "completed": 1,
+        }
+
+        await scheduler._execute_reminder(reminder)
+
+        db.mark_reminder_completed.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_execute_reminder_missing_user(self):
         """Test executing reminder when user is not found."""
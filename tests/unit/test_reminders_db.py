@@ -105,3 +105,37 @@ async def test_delete_reminder_async(real_bot):
     got2 = await db.get_reminder(rid, guild_id)
     assert got2 is None
 
+
+
+@pytest.mark.asyncio
+async def test_claim_pending_reminders_marks_non_recurring(real_bot):
+    db = real_bot.db
+    guild_id = 555
+    past = datetime.now() - timedelta(minutes=1)
+
+    once_id = await db.add_reminder(
+        guild_id=guild_id,
+        target_discord_id=1,
+        creator_discord_id=2,
+        scheduled_time=past,
+    )
+    recurring_id = await db.add_reminder(
+        guild_id=guild_id,
+        target_discord_id=1,
+        creator_discord_id=2,
+        scheduled_time=past,
+        is_recurring=True,
+        recurrence_pattern="daily",
+    )
+
+    claimed = {r["id"]: r for r in await db.claim_pending_reminders()}
+    assert claimed[once_id]["completed"] == 1
+    assert claimed[recurring_id]["completed"] == 0
+
+    # The one-shot reminder is no longer pending; the recurring one still is
+    again = {r["id"] for r in await db.claim_pending_reminders()}
+    assert once_id not in again
+    assert recurring_id in again
+
+    assert await db.release_reminder_claim(once_id)
+    assert once_id in {r["id"] for r in await db.get_pending_reminders()}